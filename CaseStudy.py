@@ -2,19 +2,26 @@
 
 from argparse import ArgumentParser
 from bs4 import BeautifulSoup
+import codecs
+from concurrent.futures import ThreadPoolExecutor
 import csv
 from datetime import datetime
 import errno
+from html.parser import HTMLParser
+import http.client
 import json
 import logging
 import os
 import random
+import threading
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
 
 import image_utilities
+import progress
+import retry_queue
 
 __author__ = "Chia Chin Yen"
 __version__ = "0.1.0"
@@ -23,6 +30,8 @@ __version__ = "0.1.0"
 # Beta parameters
 user_agent = ('Mozilla/5.0 (Macintosh; Intel Mac OS X x.y; rv:42.0) '
               'Gecko/20100101 Firefox/42.0')
+# Seconds before a stalled request fails
+timeout = 60
 
 # Logging
 if not os.path.exists('log'):
@@ -54,9 +63,31 @@ arg_parser.add_argument('-AD_id',
 arg_parser.add_argument('-AD_ca',
                         dest='ArchDaily_category',
                         help='ArchDaily project category')
+arg_parser.add_argument('-AD_start',
+                        dest='ArchDaily_start',
+                        type=int,
+                        default=1,
+                        help='ArchDaily search result page to start from')
 arg_parser.add_argument('-AD_re',
                         dest='ArchDaily_re',
                         help='ArchDaily re-download images.')
+arg_parser.add_argument('-AD_dl',
+                        dest='ArchDaily_dead_letter',
+                        nargs='?',
+                        const='',
+                        help='ArchDaily replay a dead-letter file.')
+arg_parser.add_argument('-search_interval',
+                        dest='search_interval',
+                        type=float,
+                        default=5,
+                        help='average seconds between search page requests')
+arg_parser.add_argument('-status_json',
+                        dest='status_json',
+                        help='write crawl progress to a JSON file')
+arg_parser.add_argument('-status_port',
+                        dest='status_port',
+                        type=int,
+                        help='serve crawl progress on a local port')
 
 
 class CaseStudy(object):
@@ -74,7 +105,7 @@ class CaseStudy(object):
             url, None, {'User-Agent': self.user_agent})
 
         try:
-            response = urllib.request.urlopen(request)
+            response = urllib.request.urlopen(request, timeout=timeout)
             return response
         except urllib.error.HTTPError as e:
             logging.error(e)
@@ -87,13 +118,22 @@ class CaseStudy(object):
 class CaseCollector(object):
     """A tool for intense case study."""
 
-    def __init__(self):
+    def __init__(self, tracker=None):
         """Initialize a collector."""
+        self.tracker = tracker or progress.ProgressTracker()
         self.Get_ArchDaily_article = True
         self.Get_ArchDaily_chart = True
         self.Get_ArchDaily_gallery = False
         self.ArchDaily_root = 'ArchDaily'
 
+        # Failed sub-tasks of the last ArchDaily_Operation
+        self.fetch_errors = {}
+        self.fetch_permanent = False
+
+        # Error and HTTP status of the last failed get_html
+        self.html_error = None
+        self.html_status = None
+
     def json_writer(self, path, meta=None):
         """Write json data."""
         try:
@@ -162,8 +202,14 @@ class CaseCollector(object):
         get_data=True,
         summary=True
     ):
-        """Fetch ArchDaily pages."""
+        """Fetch ArchDaily pages.
+
+        Failed sub-tasks are recorded in self.fetch_errors, and
+        self.fetch_permanent is set when retrying would not help.
+        """
         logging.info('Fetching mode : ArchDaily')
+        self.fetch_errors = {}
+        self.fetch_permanent = False
 
         # Parse the url
         ArchDaily_url = urllib.parse.urlparse(url.lstrip())
@@ -203,6 +249,9 @@ class CaseCollector(object):
                             if row['fetcher_ver'] != __version__:
                                 logging.critical('different fetcher version, '
                                                  'recommanding manual check.')
+                                self.fetch_errors['html'] = (
+                                    'different fetcher version')
+                                self.fetch_permanent = True
                                 return False
 
                             else:
@@ -236,21 +285,42 @@ class CaseCollector(object):
                 return False
 
         # fetch html and parse it for category info
+        logging.info('Fetching : '+ArchDaily_url)
+        response = self.get_html(url=ArchDaily_url)
+        if response is False:
+            logging.warning('download html failed')
+            self.fetch_errors['html'] = self.html_error
+            # Missing pages will not come back on a retry
+            self.fetch_permanent = self.html_status in (404, 410)
+            return False
         try:
-            logging.info('Fetching : '+ArchDaily_url)
-            html_response = self.get_html(url=ArchDaily_url).read()
-        except Exception:
+            html_response = response.read()
+            self.tracker.request(len(html_response))
+        except Exception as e:
             logging.warning('download html failed')
+            self.fetch_errors['html'] = repr(e)
             return False
 
         # Create BeautifulSoup parser once for all
         bs_parser = BeautifulSoup(html_response, 'html.parser')
 
         # Get ArchDaily category data
-        category_data = self.ArchDaily_get_category(bs_parser)
+        try:
+            category_data = self.ArchDaily_get_category(bs_parser)
+        except Exception as e:
+            logging.warning('Failed to parse category')
+            self.fetch_errors['html'] = repr(e)
+            # Parsing the same html fails the same way on a retry
+            self.fetch_permanent = True
+            return False
 
         # Add more information in data
         category_data['page_id'] = page_id
+        if bs_parser.article is None:
+            logging.warning('Find no article tag')
+            self.fetch_errors['html'] = 'no article tag'
+            self.fetch_permanent = True
+            return False
         if ('Text description '
                 'provided by the architects.') in bs_parser.article.text:
             category_data['text_provided_by_architects'] = True
@@ -259,6 +329,8 @@ class CaseCollector(object):
         category_data['article_date'] = self.Archdaily_time_string(bs_parser)
 
         # make path
+        if 'AD_article_type' not in category_data:
+            category_data['AD_article_type'] = None
         if category_data['AD_article_type'] == 'Projects':
             save_path = os.path.join(
                 self.ArchDaily_root,
@@ -287,6 +359,9 @@ class CaseCollector(object):
 
         else:
             logging.warning('Currently unsupported AD page types')
+            self.fetch_errors['html'] = 'unsupported page type {}'.format(
+                category_data['AD_article_type'])
+            self.fetch_permanent = True
             return False
 
         # make directory
@@ -317,6 +392,7 @@ class CaseCollector(object):
                 fetch_result['data'] = True
             else:
                 logging.warning('Failed to fetch data')
+                self.fetch_errors['data'] = 'failed to write data'
 
         if get_gallery:
             # Fetch gallery
@@ -324,6 +400,7 @@ class CaseCollector(object):
                 fetch_result['gallery'] = True
             else:
                 logging.warning('Failed to fetch gallery')
+                self.fetch_errors['gallery'] = 'failed to download images'
         else:
             # save links for future fetching
             self.ArchDaily_gallery(
@@ -331,12 +408,31 @@ class CaseCollector(object):
 
         if get_article:
             # Including chart file
-            self.ArchDaily_chart(os.path.join(
-                save_path, '{}-chart.json'.format(page_id)), bs_parser)
+            try:
+                if self.ArchDaily_chart(os.path.join(
+                        save_path, '{}-chart.json'.format(page_id)),
+                        bs_parser) is False:
+                    self.fetch_errors['chart'] = 'failed to write chart'
+            except Exception as e:
+                logging.warning('Failed to fetch chart')
+                self.fetch_errors['chart'] = repr(e)
+                self.fetch_permanent = True
 
             # Fetch article last, its function will somehow broke parser
-            if self.ArchDaily_article(os.path.join(
-                    save_path, '{}-article.txt'.format(page_id)), bs_parser):
+            try:
+                if not self.ArchDaily_article(os.path.join(
+                        save_path, '{}-article.txt'.format(page_id)),
+                        bs_parser):
+                    self.fetch_errors['article'] = 'empty article'
+                    self.fetch_permanent = True
+            except Exception as e:
+                logging.warning('Failed to fetch article')
+                self.fetch_errors['article'] = repr(e)
+                self.fetch_permanent = True
+
+            # Article is only done along with its chart
+            if not ('chart' in self.fetch_errors
+                    or 'article' in self.fetch_errors):
                 fetch_result['article'] = True
 
         # Save url file
@@ -364,10 +460,28 @@ class CaseCollector(object):
                 summary_writer = csv.DictWriter(
                     summary_file, fieldnames=headers)
                 summary_writer.writerow(fetch_result)
-                logging.critical('Fetching Success')
 
+        if self.fetch_errors:
+            logging.warning('Fetching incomplete: ' +
+                            ', '.join(self.fetch_errors))
+            return False
+
+        logging.critical('Fetching Success')
         return True
 
+    def ArchDaily_queue_job(self, url, tasks):
+        """Run ArchDaily_Operation for the given sub-tasks of a page.
+
+        Used as the worker of retry_queue.RetryQueue.
+        """
+        self.ArchDaily_Operation(
+            url,
+            get_article='chart' in tasks or 'article' in tasks,
+            get_gallery='gallery' in tasks,
+            get_data='data' in tasks,
+            summary=True)
+        return self.fetch_errors, self.fetch_permanent
+
     def ArchDaily_chart(self, path, bs_parser):
         """Find the chart item in ArchDaily."""
         chart = {}
@@ -376,7 +490,8 @@ class CaseCollector(object):
                 AD_char_item.find_next().text.strip())
 
         if chart is not None:
-            self.json_writer(path, chart)
+            if not self.json_writer(path, chart):
+                return False
             return chart
         else:
             logging.warning('Find no chart')
@@ -421,8 +536,12 @@ class CaseCollector(object):
 
     def ArchDaily_gallery(
             self, path, page_id, bs_parser, link_only=False, resize=False):
-        """Fetch ArchDaily Gallery images."""
-        all_link = []
+        """Fetch ArchDaily Gallery images.
+
+        A failed image does not stop the rest of the gallery. Images
+        already on disk are skipped, so a retry only fetches the missing.
+        """
+        images = []
         for i, gallery_item in enumerate(
                 bs_parser.find_all('a', class_='gallery-thumbs-link'), 1):
             for item in gallery_item.find_all('img'):
@@ -446,63 +565,88 @@ class CaseCollector(object):
                 image_url = image_url._replace(query='')
                 image_url = urllib.parse.urlunparse(image_url)
 
-                image_filename = os.path.join(path, image_name)
-
-                if not link_only:
-                    if not os.path.isfile(image_filename):
-                        try:
-                            req = urllib.request.Request(
-                                image_url, headers={'User-Agent': user_agent})
-                            temp_img = urllib.request.urlopen(req)
-                            with open(image_filename, 'wb') as img_file:
-                                img_file.write(temp_img.read())
-
-                            if resize:
-                                image_utilities.resize_img(
-                                    image_filename,
-                                    540,
-                                    delete=True
-                                )
-                            logging.info(image_name + ' Downloaded')
-                        except Exception as e:
-                            logging.error('Failed to download ' + image_url)
-                            logging.error('error msg: ' + str(e))
-                            return False
-                        time.sleep(abs(random.normalvariate(3, 1)))
-                else:
-                    all_link.append(image_url+'\t'+image_name)
+                images.append((image_url, image_name))
 
         if link_only:
             self.write_TXT(
                 os.path.join(path, page_id + '-image_url.txt'),
-                all_link)
+                [image_url+'\t'+image_name
+                 for image_url, image_name in images])
+            return True
+
+        missing = [(image_url, image_name)
+                   for image_url, image_name in images
+                   if not os.path.isfile(os.path.join(path, image_name))]
+        for image_url, image_name in missing:
+            self.tracker.mark(
+                'images', os.path.join(path, image_name), 'queued')
 
+        failed = 0
+        for image_url, image_name in missing:
+            image_filename = os.path.join(path, image_name)
+            try:
+                req = urllib.request.Request(
+                    image_url, headers={'User-Agent': user_agent})
+                temp_img = urllib.request.urlopen(
+                    req, timeout=timeout).read()
+                self.tracker.request(len(temp_img))
+                with open(image_filename, 'wb') as img_file:
+                    img_file.write(temp_img)
+
+                if resize:
+                    image_utilities.resize_img(
+                        image_filename,
+                        540,
+                        delete=True
+                    )
+                logging.info(image_name + ' Downloaded')
+                self.tracker.mark('images', image_filename, 'done')
+            except Exception as e:
+                logging.error('Failed to download ' + image_url)
+                logging.error('error msg: ' + str(e))
+                self.tracker.mark('images', image_filename, 'failed')
+                failed += 1
+            time.sleep(abs(random.normalvariate(3, 1)))
+
+        if failed:
+            logging.warning('{} images failed in {}'.format(failed, page_id))
+            return False
         return True
 
     def ArchDaily_re_gallery(self, dir_path):
         """Download all image in an previously fetched AD pages
         with version before 0.1.0.
         """
+        # List unfinished pages first so the progress has a total
+        pages = []
         for (dirpath, dirnames, filenames) in os.walk(dir_path):
             for filename in filenames:
                 if "-page.html" in filename:
                     finish = os.path.join(dirpath, 'finished.txt')
                     if not os.path.isfile(finish):
-                        page_id = filename.split('-')[0]
-                        fp = os.path.join(dirpath, filename)
-                        with open(fp, 'r', encoding='utf-8') as f:
-                            image_parser = BeautifulSoup(
-                                f.read(),
-                                'html.parser')
-                            if self.ArchDaily_gallery(
-                                path=dirpath,
-                                page_id=page_id,
-                                bs_parser=image_parser,
-                                link_only=False,
-                                resize=True
-                            ):
-                                with open(finish, 'w') as f:
-                                    pass
+                        pages.append((dirpath, filename))
+        self.tracker.add('pages', 'queued', len(pages))
+
+        for dirpath, filename in pages:
+            finish = os.path.join(dirpath, 'finished.txt')
+            page_id = filename.split('-')[0]
+            fp = os.path.join(dirpath, filename)
+            with open(fp, 'r', encoding='utf-8') as f:
+                image_parser = BeautifulSoup(
+                    f.read(),
+                    'html.parser')
+            if self.ArchDaily_gallery(
+                path=dirpath,
+                page_id=page_id,
+                bs_parser=image_parser,
+                link_only=False,
+                resize=True
+            ):
+                with open(finish, 'w') as f:
+                    pass
+                self.tracker.add('pages', 'done')
+            else:
+                self.tracker.add('pages', 'failed')
 
     def Archdaily_time_string(self, bs_parser):
         """Fetch the date string in AD article."""
@@ -576,15 +720,25 @@ class CaseCollector(object):
         # initiate fetching
         logging.info('Downloading html')
         request = urllib.request.Request(url, None, {'User-Agent': user_agent})
+        self.html_error = None
+        self.html_status = None
 
         try:
-            response = urllib.request.urlopen(request)
+            response = urllib.request.urlopen(request, timeout=timeout)
             return response
         except urllib.error.HTTPError as e:
             logging.error(e)
+            self.html_error = 'HTTP {} {}'.format(e.code, e.reason)
+            self.html_status = e.code
             return False
         except urllib.error.URLError as e:
             logging.error('URLError')
+            self.html_error = 'URLError {}'.format(e.reason)
+            return False
+        except (OSError, http.client.HTTPException) as e:
+            # Timeouts and dropped connections while reading the headers
+            logging.error(repr(e))
+            self.html_error = repr(e)
             return False
         '''
         except httplib.HTTPException, e:
@@ -595,73 +749,251 @@ class CaseCollector(object):
         '''
 
 
+class AD_search_link_parser(HTMLParser):
+    """Collect ArchDaily search result links without building a tree."""
+
+    def __init__(self):
+        """Initialize parser."""
+        super().__init__(convert_charrefs=True)
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        """Keep the attributes of result links."""
+        if tag == 'a':
+            attrs = dict(attrs)
+            if 'afd-search-list__link' in (attrs.get('class') or '').split():
+                self.links.append(attrs)
+
+
 class AD_page_getter(object):
     """Extract links from ArchDaily."""
 
-    def __init__(self, interval=2):
-        """Initialize class instance."""
+    def __init__(self, interval=2, prefetch=4, tracker=None):
+        """Initialize class instance.
+
+        interval is the average gap in seconds between two search
+        requests, prefetch the number of search pages fetched ahead.
+        The gap only spaces search requests of this getter.
+        """
         self.interval = interval
+        self.prefetch = prefetch
+        self.tracker = tracker or progress.ProgressTracker()
+        self.rate_lock = threading.Lock()
+        self.next_request = 0
+
+        # False if the last search stopped on a failed page
+        self.search_complete = True
+        self.search_failed_page = None
+
+        # Prefetched pages past search_bound, or after search_stop is
+        # set, are skipped instead of requested
+        self.search_bound = None
+        self.search_stop = threading.Event()
 
     def AD_project_by_category(self, category, start=1, pages=-1,
                                rand_interval=True):
-        """Harvest all project by category."""
+        """Harvest all project by category.
+
+        The next search pages are prefetched concurrently while links are
+        yielded in page order. A page shorter than the previous ones is
+        taken as a likely last page: only the page after it is fetched to
+        confirm the end. A page that keeps failing stops the search and
+        sets self.search_complete to False.
+        """
         url = ('https://www.archdaily.com/search/projects/'
                'categories/{}?page=').format(category)
-
+        self.search_complete = True
+        self.search_failed_page = None
+        self.search_bound = None
+        self.search_stop.clear()
+
+        futures = {}
+        next_page = start
+        page_size = 0
         i = start
-        while i < start+pages or pages < 0:
-            logging.info('Fetching search result page ' + str(i))
-            search_links = self.AD_link_from_page(url + str(i))
-            if search_links == []:
-                break
-            else:
-                for result in search_links:
-                    yield 'https://www.archdaily.com'+result['href']
+        with ThreadPoolExecutor(max_workers=max(1, self.prefetch)) as pool:
+            try:
+                while i < start+pages or pages < 0:
+                    # Keep the prefetch window full
+                    while (len(futures) < max(1, self.prefetch)
+                           and (next_page < start+pages or pages < 0)
+                           and (self.search_bound is None
+                                or next_page <= self.search_bound)):
+                        futures[next_page] = pool.submit(
+                            self.AD_search_page, url + str(next_page),
+                            next_page, rand_interval)
+                        next_page += 1
+
+                    logging.info('Fetching search result page ' + str(i))
+                    search_links = futures.pop(i).result()
+                    # Skipped while the end looked near, fetch it now
+                    while search_links is None:
+                        search_links = pool.submit(
+                            self.AD_search_page, url + str(i), i,
+                            rand_interval).result()
+
+                    if search_links is False:
+                        logging.error('search result page {} failed, '
+                                      'searching stopped'.format(i))
+                        self.search_complete = False
+                        self.search_failed_page = i
+                        break
+                    elif search_links == []:
+                        break
+                    else:
+                        for result in search_links:
+                            yield 'https://www.archdaily.com'+result['href']
+
+                    if len(search_links) < page_size:
+                        self.search_bound = i + 1
+                    else:
+                        self.search_bound = None
+                    page_size = max(page_size, len(search_links))
+                    i += 1
+            finally:
+                # Prefetched pages past the end skip their requests
+                self.search_stop.set()
 
-            if rand_interval:
-                time.sleep(abs(random.normalvariate(5, 2)))
-            else:
-                time.sleep(self.interval)
+        logging.critical('searching ends at page ' + str(i - 1))
 
-            i += 1
+        return self.search_complete
 
-        logging.critical('searching ends at page ' + str(i - 1))
+    def AD_rate_wait(self, rand_interval=True):
+        """Wait for the next free slot in the request rate budget."""
+        if rand_interval:
+            gap = abs(random.normalvariate(
+                self.interval, self.interval * 0.4))
+        else:
+            gap = self.interval
 
-        return True
+        with self.rate_lock:
+            now = time.time()
+            slot = max(now, self.next_request)
+            self.next_request = slot + gap
+
+        self.search_stop.wait(slot - now)
+
+    def AD_search_page(self, url, page, rand_interval=True, attempts=3):
+        """Fetch a search page within the rate budget.
 
-    def AD_link_from_page(self, url):
-        """Extract links from page."""
+        A failed page is retried after a growing pause, each attempt
+        taking its own slot in the rate budget. Return None without a
+        request once the page is past the end of the search.
+        """
+        for attempt in range(1, attempts + 1):
+            self.AD_rate_wait(rand_interval)
+            if self.AD_search_skip(page):
+                return None
+            search_links = self.AD_link_from_page(url)
+            if search_links is not False:
+                return search_links
+            if attempt < attempts:
+                self.search_stop.wait(self.interval * 2 ** attempt)
+                if self.AD_search_skip(page):
+                    return None
+                logging.warning('Retry {} ({}/{})'.format(
+                    url, attempt + 1, attempts))
+        return False
+
+    def AD_search_skip(self, page):
+        """Tell if a search page is no longer needed."""
+        bound = self.search_bound
+        return (self.search_stop.is_set()
+                or (bound is not None and page > bound))
+
+    def AD_link_from_page(self, url, chunk_size=65536):
+        """Extract links from page.
+
+        The response is parsed while it streams in, only result links are
+        kept.
+        """
         logging.info('Downloading html')
         request = urllib.request.Request(url, None, {'User-Agent': user_agent})
 
+        link_parser = AD_search_link_parser()
+        nbytes = 0
         try:
-            response = urllib.request.urlopen(request)
+            response = urllib.request.urlopen(request, timeout=timeout)
+            charset = response.headers.get_content_charset() or 'utf-8'
+            decoder = codecs.getincrementaldecoder(charset)(errors='replace')
+            while True:
+                chunk = response.read(chunk_size)
+                if not chunk:
+                    break
+                nbytes += len(chunk)
+                link_parser.feed(decoder.decode(chunk))
+            link_parser.feed(decoder.decode(b'', final=True))
+            link_parser.close()
         except urllib.error.HTTPError as e:
             logging.error(e)
             return False
         except urllib.error.URLError as e:
             logging.error('URLError')
             return False
+        except (OSError, http.client.HTTPException, LookupError) as e:
+            # Dropped connections, timeouts and unknown charsets
+            logging.error('Failed to read ' + url)
+            logging.error('error msg: ' + repr(e))
+            return False
 
-        bs_parser = BeautifulSoup(response.read(), 'html.parser')
-        search_links = bs_parser.find_all('a', class_='afd-search-list__link')
-        return search_links
+        self.tracker.request(nbytes)
+        return link_parser.links
 
 
 if __name__ == '__main__':
-    getter = AD_page_getter(interval=0)
-    fetcher = CaseCollector()
     args = arg_parser.parse_args()
+    tracker = progress.ProgressTracker(
+        status_path=args.status_json, port=args.status_port)
+    getter = AD_page_getter(
+        interval=args.search_interval, prefetch=4, tracker=tracker)
+    fetcher = CaseCollector(tracker)
     if args.ArchDaily_page_ID is not None:
         fetcher.ArchDaily_Operation(
             fetcher.Archdaily_ID_to_url(args.ArchDaily_page_ID),
             summary=False)
 
     elif args.ArchDaily_category is not None:
+        tracker.start()
+        queue = retry_queue.RetryQueue(
+            os.path.join(fetcher.ArchDaily_root, 'AD_dead_letter.jsonl'),
+            pause=5, tracker=tracker)
+        # List the whole category first so the progress has a total
         for page_url in getter.AD_project_by_category(
-                category=args.ArchDaily_category):
-            time.sleep(abs(random.normalvariate(5, 2)))
-            fetcher.ArchDaily_Operation(page_url, summary=True)
+                category=args.ArchDaily_category,
+                start=args.ArchDaily_start):
+            queue.put(page_url)
+        if not getter.search_complete:
+            # Keep where the listing stopped so it can be resumed
+            resume_path = os.path.join(
+                fetcher.ArchDaily_root, 'AD_search_resume.jsonl')
+            if not os.path.exists(fetcher.ArchDaily_root):
+                os.makedirs(fetcher.ArchDaily_root)
+            fetcher.log_TXT(resume_path, json.dumps({
+                'category': args.ArchDaily_category,
+                'page': getter.search_failed_page,
+                'time': str(datetime.now()),
+            }))
+            logging.error(
+                'Category listing stopped at page {0}, fetching the {1} '
+                'pages found. Resume with -AD_ca {2} -AD_start {0}'.format(
+                    getter.search_failed_page, len(queue),
+                    args.ArchDaily_category))
+        queue.drain(fetcher.ArchDaily_queue_job)
+        tracker.stop()
+
+    elif args.ArchDaily_dead_letter is not None:
+        tracker.start()
+        queue = retry_queue.RetryQueue(
+            os.path.join(fetcher.ArchDaily_root, 'AD_dead_letter.jsonl'),
+            pause=5, tracker=tracker)
+        queue.replay(args.ArchDaily_dead_letter or None)
+        queue.drain(fetcher.ArchDaily_queue_job)
+        tracker.stop()
+
+    elif args.ArchDaily_re is not None:
+        tracker.start()
+        fetcher.ArchDaily_re_gallery(args.ArchDaily_re)
+        tracker.stop()
 
     elif args.ArchDaily_page_ID is None:
         while True:
@@ -14,12 +14,15 @@ def resize_img(fp, Y_size, delete=False):
     img = Image.open(fp).convert('RGB')
     fnam, ext = os.path.splitext(fp)
     width, height = img.size
+    # LANCZOS is the filter formerly named ANTIALIAS
     imgResize = img.resize((int(width * (Y_size / height)), Y_size),
-                           Image.ANTIALIAS)
+                           Image.LANCZOS)
 
     if delete:
         imgResize.save(fnam + '.jpg', 'JPEG', quality=90)
-        os.remove(fp)
+        # A .jpg source has just been overwritten by its resized copy
+        if os.path.abspath(fp) != os.path.abspath(fnam + '.jpg'):
+            os.remove(fp)
     else:
         imgResize.save(fnam + ' resized.jpg', 'JPEG', quality=90)
 
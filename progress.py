@@ -0,0 +1,210 @@
+"""
+Progress, throughput and ETA reporting for long crawls.
+"""
+from collections import deque
+from datetime import datetime
+import http.server
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+
+class ProgressTracker(object):
+    """Count pages and images, measure throughput and report it.
+
+    Counting is always on and thread-safe. Calling start() adds a
+    reporter thread that prints a status line to the terminal, writes
+    the status JSON file and serves it on a local HTTP port.
+    """
+
+    def __init__(self, status_path=None, port=None, interval=10, window=60):
+        """Initialize a tracker."""
+        self.status_path = status_path
+        self.port = port
+        self.interval = interval
+        self.window = window
+
+        self.lock = threading.Lock()
+        self.counts = {
+            'pages': dict.fromkeys(['queued', 'done', 'failed'], 0),
+            'images': dict.fromkeys(['queued', 'done', 'failed'], 0),
+        }
+        self.states = {'pages': {}, 'images': {}}
+        self.bytes = 0
+        self.requests = 0
+        self.recent = deque()
+        self.started = time.time()
+        self.last_request = None
+
+        self.stopping = threading.Event()
+        self.reporter = None
+        self.server = None
+
+    def add(self, kind, state, n=1):
+        """Add n items of kind ('pages' or 'images') to a state."""
+        with self.lock:
+            self.counts[kind][state] += n
+
+    def mark(self, kind, key, state):
+        """Move the item key of kind to a state.
+
+        An item is queued only once, however many times it is retried,
+        and counts in the state of its latest outcome.
+        """
+        with self.lock:
+            previous = self.states[kind].get(key)
+            if state == 'queued':
+                if previous is None:
+                    self.states[kind][key] = state
+                    self.counts[kind]['queued'] += 1
+                return
+            if previous in ('done', 'failed'):
+                self.counts[kind][previous] -= 1
+            elif previous is None:
+                self.counts[kind]['queued'] += 1
+            self.states[kind][key] = state
+            self.counts[kind][state] += 1
+
+    def request(self, nbytes=0):
+        """Record a finished request and the bytes it downloaded."""
+        now = time.time()
+        with self.lock:
+            self.requests += 1
+            self.bytes += nbytes
+            self.last_request = now
+            self.recent.append((now, nbytes))
+
+    def snapshot(self):
+        """Return the current status as a dictionary."""
+        now = time.time()
+        with self.lock:
+            while self.recent and self.recent[0][0] < now - self.window:
+                self.recent.popleft()
+            span = max(1e-6, min(self.window, now - self.started))
+            recent_bytes = sum(nbytes for _, nbytes in self.recent)
+            status = {
+                'time': str(datetime.now()),
+                'elapsed': round(now - self.started, 1),
+                'bytes': self.bytes,
+                'requests': self.requests,
+                'bytes_per_sec': round(recent_bytes / span, 1),
+                'request_rate': round(len(self.recent) / span, 3),
+                'idle': (None if self.last_request is None
+                         else round(now - self.last_request, 1)),
+            }
+            for kind, count in self.counts.items():
+                status[kind] = dict(count)
+                status[kind]['remaining'] = max(
+                    0, count['queued'] - count['done'] - count['failed'])
+
+        # Estimate from the average pace of the run so far
+        etas = []
+        for kind in self.counts:
+            finished = status[kind]['done'] + status[kind]['failed']
+            if finished and status[kind]['remaining']:
+                etas.append(status[kind]['remaining']
+                            * status['elapsed'] / finished)
+        status['eta'] = round(max(etas), 1) if etas else None
+        return status
+
+    def render(self, status=None):
+        """Return a compact one-line status."""
+        status = status or self.snapshot()
+        parts = []
+        for kind in ('pages', 'images'):
+            count = status[kind]
+            if count['queued']:
+                part = '{} {}/{}'.format(
+                    kind, count['done'], count['queued'])
+                if count['failed']:
+                    part += ' ({} failed)'.format(count['failed'])
+                parts.append(part)
+        parts.append('{} KB/s'.format(round(status['bytes_per_sec'] / 1024)))
+        parts.append('{} req/s'.format(status['request_rate']))
+        if status['eta'] is not None:
+            parts.append('ETA {}'.format(format_seconds(status['eta'])))
+        if status['idle'] is not None and status['idle'] > 2 * self.window:
+            parts.append('idle {}'.format(format_seconds(status['idle'])))
+        return ' | '.join(parts)
+
+    def write_status(self, status=None):
+        """Write the status JSON file."""
+        if self.status_path is None:
+            return
+        status = status or self.snapshot()
+        temp_path = self.status_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as status_file:
+            json.dump(status, status_file, ensure_ascii=False, indent=2)
+        # Replace at once so readers never see a partial file
+        os.replace(temp_path, self.status_path)
+
+    def report(self):
+        """Print the status line and write the status file.
+
+        Errors are logged, so reporting never stops the crawl.
+        """
+        try:
+            status = self.snapshot()
+            sys.stderr.write('[progress] ' + self.render(status) + '\n')
+            sys.stderr.flush()
+            self.write_status(status)
+        except Exception as e:
+            logging.error('Failed to report progress: ' + str(e))
+
+    def start(self):
+        """Start reporting in the background."""
+        if self.port is not None:
+            self.server = http.server.HTTPServer(
+                ('127.0.0.1', self.port), status_handler(self))
+            threading.Thread(
+                target=self.server.serve_forever, daemon=True).start()
+
+        self.reporter = threading.Thread(target=self.run, daemon=True)
+        self.reporter.start()
+        return self
+
+    def run(self):
+        """Report every interval until stopped."""
+        while not self.stopping.wait(self.interval):
+            self.report()
+
+    def stop(self):
+        """Stop reporting and write the final status."""
+        self.stopping.set()
+        if self.reporter is not None:
+            self.reporter.join()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        self.report()
+
+
+def status_handler(tracker):
+    """Return a request handler serving the status of the tracker."""
+    class StatusHandler(http.server.BaseHTTPRequestHandler):
+        """Answer every GET with the status JSON."""
+
+        def do_GET(self):
+            """Send the current status."""
+            body = json.dumps(tracker.snapshot()).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            """Keep status requests out of the terminal."""
+            pass
+
+    return StatusHandler
+
+
+def format_seconds(seconds):
+    """Format seconds as H:MM:SS."""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return '{}:{:02d}:{:02d}'.format(hours, minutes, seconds)
@@ -0,0 +1,164 @@
+"""
+Retry scheduler with backoff and a dead-letter log for page fetching.
+"""
+from datetime import datetime
+import heapq
+import json
+import logging
+import os
+import random
+import time
+
+import progress
+
+# Sub-tasks of a page fetch, in the order ArchDaily_Operation runs them
+TASKS = ('html', 'data', 'chart', 'article', 'gallery')
+
+
+class RetryQueue(object):
+    """Schedule pages, retry failed sub-tasks and dead-letter the rest.
+
+    The worker is called as ``worker(url, tasks)`` and returns a tuple of
+    ``(errors, permanent)``, where ``errors`` maps each failed sub-task to
+    its error message. An empty ``errors`` means the page is done.
+    ``pause`` is the average gap in seconds between two pages.
+    """
+
+    def __init__(self, dead_letter_path, max_attempts=4,
+                 base_delay=30, max_delay=900, pause=0, tracker=None):
+        """Initialize a queue."""
+        self.dead_letter_path = dead_letter_path
+        self.tracker = tracker or progress.ProgressTracker()
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.pause = pause
+
+        self.pending = []
+        self.counter = 0
+        self.stats = dict.fromkeys(
+            ['queued', 'done', 'retried', 'dead'], 0)
+
+    def __len__(self):
+        """Return the number of scheduled pages."""
+        return len(self.pending)
+
+    def put(self, url, tasks=None, attempts=0, delay=0):
+        """Schedule a page for fetching."""
+        item = {
+            'url': url,
+            'tasks': list(tasks) if tasks else list(TASKS),
+            'attempts': attempts,
+            'errors': {},
+        }
+        # The counter keeps FIFO order among items due at the same time
+        heapq.heappush(
+            self.pending, (time.time() + delay, self.counter, item))
+        self.counter += 1
+        self.stats['queued'] += 1
+        if attempts == 0:
+            self.tracker.add('pages', 'queued')
+        return item
+
+    def backoff(self, attempts):
+        """Return the delay in seconds before the next attempt."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.5)
+
+    def report(self, item, errors, permanent=False):
+        """Record the outcome of an attempt and reschedule if needed."""
+        item['attempts'] += 1
+
+        if not errors:
+            self.stats['done'] += 1
+            self.tracker.add('pages', 'done')
+            return True
+
+        item['errors'] = errors
+        for task, error in errors.items():
+            logging.warning(
+                '{} failed on {}: {}'.format(task, item['url'], error))
+
+        if permanent or item['attempts'] >= self.max_attempts:
+            self.dead_letter(item)
+            return False
+
+        # HTML is the base of every other sub-task
+        if 'html' in errors:
+            tasks = item['tasks']
+        else:
+            tasks = [task for task in item['tasks'] if task in errors]
+
+        delay = self.backoff(item['attempts'])
+        logging.info('Retry {} in {:.0f}s (attempt {}/{})'.format(
+            item['url'], delay, item['attempts'] + 1, self.max_attempts))
+        self.put(item['url'], tasks, item['attempts'], delay)
+        self.stats['retried'] += 1
+        return False
+
+    def dead_letter(self, item):
+        """Append a permanently failed page to the dead-letter file."""
+        record = dict(item)
+        record['time'] = str(datetime.now())
+
+        folder = os.path.dirname(self.dead_letter_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        with open(self.dead_letter_path, 'a', encoding='utf-8') as dl_file:
+            dl_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        self.stats['dead'] += 1
+        self.tracker.add('pages', 'failed')
+        logging.error('Dead-lettered ' + item['url'])
+
+    def replay(self, path=None):
+        """Schedule every page in a dead-letter file again.
+
+        The file is renamed before replaying, so pages failing again are
+        written to a fresh dead-letter file.
+        """
+        path = path or self.dead_letter_path
+        if not os.path.isfile(path):
+            logging.warning('No dead-letter file at ' + path)
+            return 0
+
+        replayed = path + datetime.now().strftime('.%Y%m%d-%H%M%S')
+        os.rename(path, replayed)
+
+        count = 0
+        with open(replayed, 'r', encoding='utf-8') as dl_file:
+            for line in dl_file:
+                if line.strip() == '':
+                    continue
+                record = json.loads(line)
+                self.put(record['url'], record.get('tasks'))
+                count += 1
+
+        logging.info('Replaying {} pages from {}'.format(count, replayed))
+        return count
+
+    def run_next(self, worker):
+        """Wait for the next scheduled page and run it."""
+        due, _, item = heapq.heappop(self.pending)
+        wait = due - time.time()
+        if wait > 0:
+            time.sleep(wait)
+
+        try:
+            errors, permanent = worker(item['url'], item['tasks'])
+        except Exception as e:
+            errors, permanent = {'html': repr(e)}, False
+
+        if self.pause:
+            time.sleep(abs(random.normalvariate(self.pause, self.pause * 0.4)))
+        return self.report(item, errors, permanent)
+
+    def drain(self, worker):
+        """Run until every page is done or dead-lettered."""
+        while self.pending:
+            self.run_next(worker)
+
+        logging.critical(
+            'Queue finished: {done} done, {retried} retries, '
+            '{dead} dead-lettered'.format(**self.stats))
+        return self.stats['dead'] == 0